@@ -1,104 +1,68 @@
 import asyncio
-from playwright import async_api
-from playwright.async_api import expect
+import re
+import pytest
+from urllib.parse import quote
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
+# Sign-in URL carrying a URL-encoded SQL injection payload
+SQLI = "http://localhost:3000/signin?input=" + quote("' OR '1'='1")
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_security_unauthorized(new_context, nav, storage_state):
+    # Create a context from the saved landing-page state for the sign-in flow, and a
+    # fresh context (like an incognito window) for the unauthenticated probes
+    async with (
+        await new_context(viewport={"width": 1280, "height": 720}, storage_state=storage_state) as context,
+        await new_context(viewport={"width": 1280, "height": 720}) as probe_context,
+    ):
         # Open a new page in the browser context
         page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # -> Attempt to access project data without authentication by navigating to a project data URL or trying to access data endpoints.
-        await page.goto('http://localhost:3000/projects', timeout=10000)
-        await asyncio.sleep(3)
-        
-
-        # -> Try SQL injection in input fields and API parameters to verify input sanitization and injection attack prevention.
-        await page.goto('http://localhost:3000/signin?input=' OR '1'='1', timeout=10000)
-        await asyncio.sleep(3)
-        
 
-        # -> Use a revoked API key to access the public API and confirm access is blocked.
-        await page.goto('http://localhost:3000/api/projects?api_key=REVOKED_API_KEY', timeout=10000)
-        await asyncio.sleep(3)
-        
+        # Probe unauthenticated access, SQL injection, a revoked API key and API key enumeration
+        urls = [
+            "http://localhost:3000/projects",
+            SQLI,
+            "http://localhost:3000/api/projects?api_key=REVOKED_API_KEY",
+            "http://localhost:3000/api/projects?api_key=123456",
+            "http://localhost:3000/api/projects?api_key=abcdef",
+            "http://localhost:3000/api/projects?api_key=000000",
+        ]
 
+        # Interact with the page elements to simulate user flow
         # -> Navigate to sign-in page to log in as a user from a different organization for access control testing.
-        await page.goto('http://localhost:3000/signin', timeout=10000)
-        await asyncio.sleep(3)
-        
+        # Open the probe pages while the dev server responds; gather surfaces the first error from either side.
+        pages, _ = await asyncio.gather(
+            asyncio.gather(*[probe_context.new_page() for _ in urls]),
+            nav(page, 'http://localhost:3000/signin'),
+        )
 
         # -> Attempt to sign in with a Google account from a different organization domain to test organization-based access restrictions.
-        frame = context.pages[-1]
-        # Click 'Sign in with Google' button to initiate login for a user from a different organization
-        elem = frame.locator('xpath=html/body/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+        # Click 'Continue with Google' button to initiate login for a user from a different organization
+        await page.get_by_role("button", name=re.compile(r"Continue with Google", re.I)).click(timeout=5000)
+        # The stubbed OAuth round-trip must come back to the app's error or sign-in page on localhost
+        await page.wait_for_url(re.compile(r"localhost:3000/(auth/error|signin\?error)"))
+
+        # -> Run the probes. None of these depend on each other, so each one runs concurrently on its own page.
+        # Only the response is checked, so navigation resolves as soon as it commits.
+        responses = await asyncio.gather(
+            *[p.goto(u, wait_until="commit") for p, u in zip(pages, urls)]
+        )
 
-        # -> Test API key enumeration by attempting to access the API with common or sequential API keys and verify that enumeration is prevented.
-        await page.goto('http://localhost:3000/api/projects?api_key=123456', timeout=10000)
-        await asyncio.sleep(3)
-        
+        # Protected dashboard routes redirect anonymous users to the sign-in page
+        assert responses[0].request.redirected_from is not None, f"{urls[0]} returned {responses[0].status} without redirecting"
+        assert pages[0].url.startswith("http://localhost:3000/signin"), f"{urls[0]} was not redirected to sign-in"
 
-        await page.goto('http://localhost:3000/api/projects?api_key=abcdef', timeout=10000)
-        await asyncio.sleep(3)
-        
+        # The injection payload must neither crash the server, bypass sign-in nor leak SQL errors
+        assert responses[1].status < 500, f"{SQLI} returned {responses[1].status}"
+        assert pages[1].url.startswith("http://localhost:3000/signin"), f"{SQLI} left the sign-in page"
+        assert "SQL" not in await responses[1].text(), f"{SQLI} leaked an SQL error"
 
-        await page.goto('http://localhost:3000/api/projects?api_key=000000', timeout=10000)
-        await asyncio.sleep(3)
-        
+        # The API must reject revoked and guessed keys with the authentication error body
+        for url, response in zip(urls[2:], responses[2:]):
+            assert response.status in (401, 403), f"{url} returned {response.status}"
+            body = await response.json()
+            assert body["error"] == "Authentication required", f"{url} returned error {body.get('error')!r}"
+            assert body["message"] == "Please sign in to continue.", f"{url} returned message {body.get('message')!r}"
 
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        await expect(frame.locator('text=Authentication required').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Please sign in to continue.').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    # Running the file directly goes through pytest so the conftest fixtures apply
+    raise SystemExit(pytest.main([__file__]))
@@ -1,99 +1,49 @@
 import asyncio
-from playwright import async_api
+import re
+import pytest
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # -> Open the application on desktop browsers (Chrome, Firefox, Safari, Edge) and verify UI components render without visual defects.
-        frame = context.pages[-1]
-        # Click the 'Sign in with Google' button to proceed with login and access main UI components for further testing.
-        elem = frame.locator('xpath=html/body/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+# Run the render checks for one device profile inside its own browser context
+async def check_device(context, nav):
+    # Open a new page in the browser context
+    page = await context.new_page()
+
+    # Navigate to your target URL and wait until the DOM has been parsed
+    await nav(page, "http://localhost:3000")
 
-        # -> Open the application on mobile devices (iOS and Android) and check UI responsiveness and layout adaptation.
-        await page.goto('http://localhost:3000', timeout=10000)
-        await asyncio.sleep(3)
-        
+    # Interact with the page elements to simulate user flow
+    # -> Open the application and verify UI components render without visual defects.
+    # Click the 'Continue with Google' button to proceed with login and access main UI components for further testing.
+    await page.get_by_role("button", name=re.compile(r"Continue with Google", re.I)).click(timeout=5000)
+    # The stubbed OAuth round-trip must come back to the app's error or sign-in page on localhost
+    await page.wait_for_url(re.compile(r"localhost:3000/(auth/error|signin\?error)"))
 
-        # -> Open the application on mobile devices (iOS and Android) and check UI responsiveness and layout adaptation.
-        await page.goto('http://localhost:3000/signin', timeout=10000)
-        await asyncio.sleep(3)
-        
+    # -> Open the sign-in page and check UI responsiveness and layout adaptation.
+    await nav(page, 'http://localhost:3000/signin')
 
-        # -> Simulate opening the application on mobile devices (iOS and Android) to check UI responsiveness and layout adaptation.
-        await page.goto('http://localhost:3000/signin', timeout=10000)
-        await asyncio.sleep(3)
-        
+    # -> Navigate to other pages or open dialogs to verify rendering and accessibility of grids, dialogs, buttons, and notifications across devices and browsers.
+    # Click 'Continue with Google' button to attempt navigation or trigger dialogs for further UI component testing.
+    await page.get_by_role("button", name=re.compile(r"Continue with Google", re.I)).click(timeout=5000)
+    # The stubbed OAuth round-trip must come back to the app's error or sign-in page on localhost
+    await page.wait_for_url(re.compile(r"localhost:3000/(auth/error|signin\?error)"))
 
-        # -> Simulate mobile device viewports to check UI responsiveness and layout adaptation on iOS and Android devices.
-        await page.mouse.wheel(0, await page.evaluate('() => window.innerHeight'))
-        
+    # --> Assertions to verify final state
+    try:
+        await expect(page.locator('text=UI Components Rendered Successfully').first).to_be_visible(timeout=1000)
+    except AssertionError:
+        raise AssertionError('Test plan execution failed: UI components did not render correctly or accessibility compliance was not met across devices and browsers.')
 
-        # -> Navigate to other pages or open dialogs to verify rendering and accessibility of grids, dialogs, buttons, and notifications across devices and browsers.
-        frame = context.pages[-1]
-        # Click 'Sign in with Google' button to attempt navigation or trigger dialogs for further UI component testing.
-        elem = frame.locator('xpath=html/body/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+@pytest.mark.asyncio(loop_scope="session")
+async def test_ui_renders_responsively(pw, new_context, nav, storage_state):
+    # Create one context per device profile: desktop, iOS and Android, all seeded from the saved landing-page state
+    async with (
+        await new_context(viewport={"width": 1280, "height": 720}, storage_state=storage_state) as desktop_ctx,
+        await new_context(**pw.devices["iPhone 13"], storage_state=storage_state) as ios_ctx,
+        await new_context(**pw.devices["Pixel 5"], storage_state=storage_state) as android_ctx,
+    ):
+        # Run the same checks against every device concurrently on the shared browser
+        await asyncio.gather(*[check_device(context, nav) for context in (desktop_ctx, ios_ctx, android_ctx)])
 
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        try:
-            await expect(frame.locator('text=UI Components Rendered Successfully').first).to_be_visible(timeout=1000)
-        except AssertionError:
-            raise AssertionError('Test plan execution failed: UI components did not render correctly or accessibility compliance was not met across devices and browsers.')
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    # Running the file directly goes through pytest so the conftest fixtures apply
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,83 @@
+import os
+import pytest
+import pytest_asyncio
+from urllib.parse import urlparse
+from playwright import async_api
+
+
+# Abort every request that leaves the dev server (fonts, avatars, analytics) so
+# navigations only wait on same-origin resources
+async def block_thirdparty(route):
+    if urlparse(route.request.url).hostname == "localhost":
+        await route.continue_()
+    else:
+        await route.abort()
+
+
+# Google's OAuth consent screen cannot complete in CI, so answer it locally by
+# bouncing straight back to the NextAuth callback with a dummy code
+async def stub_google_oauth(route):
+    await route.fulfill(
+        status=302,
+        headers={"Location": "http://localhost:3000/api/auth/callback/google?code=TEST"},
+    )
+
+
+@pytest.fixture(scope="session")
+def nav():
+    # Navigate and resolve once the DOM has been parsed; the timeout comes from the context default
+    async def nav(page, url):
+        return await page.goto(url, wait_until="domcontentloaded")
+
+    return nav
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def pw():
+    # Start a single Playwright session shared by every test
+    async with async_api.async_playwright() as pw:
+        yield pw
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def browser(pw):
+    args = [
+        "--window-size=1280,720",         # Set the browser window size
+        "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
+    ]
+    # Chromium refuses to start its sandbox as root, which is common in CI containers
+    if hasattr(os, "geteuid") and os.geteuid() == 0:
+        args.append("--no-sandbox")
+
+    # Launch one Chromium instance; each test opens its own contexts on it
+    async with await pw.chromium.launch(headless=True, args=args) as browser:
+        yield browser
+
+
+@pytest.fixture(scope="session")
+def new_context(browser):
+    # Create contexts on the shared browser with the suite's timeout and routing policy.
+    # Routes run most recently registered first, so the OAuth stub takes precedence
+    # over the catch-all third-party block.
+    async def new_context(**kwargs):
+        context = await browser.new_context(**kwargs)
+        context.set_default_navigation_timeout(15000)
+        context.set_default_timeout(5000)
+        await context.route("**/*", block_thirdparty)
+        await context.route("**/accounts.google.com/**", stub_google_oauth)
+        return context
+
+    return new_context
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def storage_state(new_context, nav, tmp_path_factory):
+    # Load the landing page once and persist its cookies and local storage so
+    # later contexts start from that state instead of an empty cookie jar
+    path = tmp_path_factory.mktemp("playwright") / "state.json"
+    async with await new_context() as context:
+        page = await context.new_page()
+        await nav(page, "http://localhost:3000")
+        await context.storage_state(path=path)
+
+    return str(path)